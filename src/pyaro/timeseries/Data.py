@@ -79,6 +79,16 @@ class Data(abc.ABC):
     def __len__(self) -> int:
         pass
 
+    def station_codes(self) -> tuple[np.ndarray, np.ndarray]:
+        """The unique station identifiers and the integer code of each data-point,
+        i.e. np.unique(stations, return_inverse=True)
+
+        Implementations may cache the result, e.g. for use by several filters.
+
+        :return: tuple of unique stations and the index of each data-point into them
+        """
+        return np.unique(self.stations, return_inverse=True)
+
     @property
     def variable(self) -> str:
         """Variable name for all the data
@@ -144,7 +154,8 @@ class Data(abc.ABC):
     @abc.abstractmethod
     def start_times(self) -> np.ndarray:
         """A 1-dimensional array of int64 datetimes indicating the start
-        of the measurement
+        of the measurement. Readers should return datetime64[s] arrays, other
+        types need to be converted by the filters.
 
         :return: 1dim array of datetime64
         """
@@ -154,7 +165,8 @@ class Data(abc.ABC):
     @abc.abstractmethod
     def end_times(self) -> np.ndarray:
         """A 1-dimensional array of int64 datetimes indicating the end
-        of the measurement
+        of the measurement. Readers should return datetime64[s] arrays, other
+        types need to be converted by the filters.
 
         :return: 1dim array of datetime64
         """
@@ -259,10 +271,14 @@ class NpStructuredData(Data):
         ("standard_deviations", "f"),
     ]
 
+    # cache of station_codes, also for subclasses not calling this __init__
+    _station_codes = None
+
     def __init__(self, variable="", units="") -> None:
         self._variable = variable
         self._units = units
         self._data = DynamicRecArray(self._dtype)
+        self._station_codes = None
 
     def __len__(self) -> int:
         """Number of data-points"""
@@ -301,6 +317,7 @@ class NpStructuredData(Data):
         :param flag: defaults to Flag.VALID
         :param standard_deviation: defaults to np.nan
         """
+        self._station_codes = None
         if type(value).__module__ == np.__name__:  # numpy array handling
             self._data.append_array(
                 values=value,
@@ -356,8 +373,21 @@ class NpStructuredData(Data):
         self._variable = variable
         self._units = units
         self._data.set_data(data)
+        self._station_codes = None
         return
 
+    def station_codes(self) -> tuple[np.ndarray, np.ndarray]:
+        """The unique station identifiers and the integer code of each data-point.
+
+        The result is cached until the data is changed with append or set_data.
+        The arrays of this object must therefore not be modified in place.
+
+        :return: tuple of unique stations and the index of each data-point into them
+        """
+        if self._station_codes is None:
+            self._station_codes = np.unique(self.stations, return_inverse=True)
+        return self._station_codes
+
     def slice(self, index):
         newData = NpStructuredData()
         newData.set_data(self.variable, self.units, self._data.data[index])
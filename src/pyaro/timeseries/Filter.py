@@ -1,11 +1,13 @@
 import json
 import logging
 import math
+import numbers
 import abc
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
 import csv
 from datetime import datetime
 import inspect
+import itertools
 import pathlib
 import re
 import sys
@@ -30,12 +32,20 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# signatures of the filter constructors, by filter-class
+_signature_cache: dict[type, inspect.Signature] = {}
+
 
 class Filter(abc.ABC):
     """Base-class for all filters used from pyaro-Readers"""
 
     time_format = "%Y-%m-%d %H:%M:%S"
 
+    # True if the filter does not change after construction, does not depend
+    # on external files and init_kwargs returns copies, so one instance can be
+    # shared by the FilterFactory. Must be set by each class, it is not inherited.
+    _cacheable = False
+
     def __init__(self, **kwargs):
         """constructor of Filters. All filters must have a default constructor without kwargs
         for an empty filter object"""
@@ -46,7 +56,10 @@ class Filter(abc.ABC):
 
         :return: a dictionary possible to use as kwargs for the new method
         """
-        ba = inspect.signature(self.__class__.__init__).bind(0)
+        cls = self.__class__
+        if cls not in _signature_cache:
+            _signature_cache[cls] = inspect.signature(cls.__init__)
+        ba = _signature_cache[cls].bind(0)
         ba.apply_defaults()
         args = ba.arguments
         args.pop("self")
@@ -124,11 +137,58 @@ class FilterException(Exception):
     pass
 
 
+def _station_index(data: Data, stat_names) -> npt.NDArray[np.bool_]:
+    """Index of the data belonging to any of the stations
+
+    Only the unique station names of the data are tested against stat_names,
+    using the (possibly cached) Data.station_codes.
+
+    :param data: Data of e.g. a Reader.data(varname) call
+    :param stat_names: set of station names
+    :return: boolean index for Data.slice(idx)
+    """
+    unique, inverse = data.station_codes()
+    keep = np.fromiter((u in stat_names for u in unique), dtype=bool, count=len(unique))
+    return keep[inverse]
+
+
+def _include_exclude_test(include, exclude):
+    """Create a test-function for include and exclude lists
+
+    :param include: container of values to include, empty meaning all
+    :param exclude: container of values to exclude
+    :return: function returning True if a value passes include and exclude
+    """
+    if len(include) == 0:
+        return lambda x: x not in exclude
+    return lambda x: x in include and x not in exclude
+
+
+def _freeze(value):
+    """Convert (nested) lists, tuples, sets and dicts to a hashable equivalent
+
+    :param value: a filter-argument
+    :return: hashable representation of value, used as cache key
+    """
+    if isinstance(value, dict):
+        return (dict, frozenset((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return (type(value), tuple(_freeze(v) for v in value))
+    if isinstance(value, (set, frozenset)):
+        return (frozenset, frozenset(_freeze(v) for v in value))
+    # keep the type, 1, 1.0, True and Flag.INVALID are equal but not the same kwarg
+    return (type(value), value)
+
+
 class FilterFactory:
+    # number of constructed filters kept for reuse
+    cache_size = 32
+
     def __new__(cls):
         if not hasattr(cls, "instance"):
             cls.instance = super(FilterFactory, cls).__new__(cls)
             cls.instance._filters = {}
+            cls.instance._cache = OrderedDict()
         return cls.instance
 
     def register(self, filter: Filter):
@@ -145,13 +205,33 @@ class FilterFactory:
 
     def get(self, name, **kwargs):
         """Get a filter by name. If kwargs are given, they will be send to the
-        filters new method
+        filters new method. Filters marked as cacheable are shared: without kwargs
+        the registered filter is returned, and recently used filters are reused
+        for equal kwargs.
 
         :param name: a filter-name
         :return: a filter, optionally initialized
         """
         filter = self._filters[name]
-        return filter.__class__(**kwargs)
+        # only classes declaring themselves cacheable, not their subclasses
+        if not type(filter).__dict__.get("_cacheable", False):
+            return filter.__class__(**kwargs)
+        if not kwargs:
+            return filter
+        try:
+            key = (name, _freeze(kwargs))
+            hash(key)
+        except TypeError:
+            # unhashable kwargs, e.g. arrays, cannot be cached
+            return filter.__class__(**kwargs)
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            return self._cache[key]
+        instance = filter.__class__(**kwargs)
+        self._cache[key] = instance
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return instance
 
     def list(self) -> dict[str, Filter]:
         """List all available filter-names and their initializations"""
@@ -241,21 +321,24 @@ class VariableNameFilter(Filter):
     :param exclude: list of variables to exclude (new names if changed), defaults to []
     """
 
+    _cacheable = True
+
     def __init__(
         self,
         reader_to_new: dict[str, str] = {},
         include: list[str] = [],
         exclude: list[str] = [],
     ):
-        self._reader_to_new = reader_to_new
+        self._reader_to_new = dict(reader_to_new)
         self._new_to_reader = {v: k for k, v in reader_to_new.items()}
-        self._include = set(include)
-        self._exclude = set(exclude)
+        self._include = frozenset(include)
+        self._exclude = frozenset(exclude)
+        self._accept = _include_exclude_test(self._include, self._exclude)
         return
 
     def init_kwargs(self):
         return {
-            "reader_to_new": self._reader_to_new,
+            "reader_to_new": dict(self._reader_to_new),
             "include": list(self._include),
             "exclude": list(self._exclude),
         }
@@ -290,12 +373,9 @@ class VariableNameFilter(Filter):
         :param variables: variable names as in the reader
         :return: valid variable names in translated nomenclature
         """
-        newlist = []
-        for x in variables:
-            newvar = self.new_varname(x)
-            if self.has_variable(newvar):
-                newlist.append(newvar)
-        return newlist
+        accept = self._accept
+        translate = self._reader_to_new.get
+        return [x for x in (translate(v, v) for v in variables) if accept(x)]
 
     def has_variable(self, variable) -> bool:
         """check if a variable-name is in the list of variables applying include and exclude
@@ -303,12 +383,7 @@ class VariableNameFilter(Filter):
         :param variable: variable name in translated, i.e. new scheme
         :return: True or False
         """
-        if len(self._include) > 0:
-            if not variable in self._include:
-                return False
-        if variable in self._exclude:
-            return False
-        return True
+        return self._accept(variable)
 
     def has_reader_variable(self, variable) -> bool:
         """Check if variable-name is in the list of variables applying include and exclude
@@ -334,18 +409,18 @@ class StationReductionFilter(DataIndexFilter):
     def filter_data_idx(
         self, data: Data, stations: dict[str, Station], variables: list[str]
     ):
-        stat_names = self.filter_stations(stations).keys()
-        dstations = data.stations
-        stat_names = np.fromiter(stat_names, dtype=dstations.dtype)
-        index = np.isin(dstations, stat_names)
-        return index
+        stat_names = set(self.filter_stations(stations).keys())
+        return _station_index(data, stat_names)
 
 
 @registered_filter
 class StationFilter(StationReductionFilter):
+    _cacheable = True
+
     def __init__(self, include: list[str] = [], exclude: list[str] = []):
-        self._include = set(include)
-        self._exclude = set(exclude)
+        self._include = frozenset(include)
+        self._exclude = frozenset(exclude)
+        self._accept = _include_exclude_test(self._include, self._exclude)
         return
 
     def init_kwargs(self):
@@ -355,15 +430,11 @@ class StationFilter(StationReductionFilter):
         return "stations"
 
     def has_station(self, station) -> bool:
-        if len(self._include) > 0:
-            if station not in self._include:
-                return False
-        if station in self._exclude:
-            return False
-        return True
+        return self._accept(station)
 
     def filter_stations(self, stations: dict[str, Station]) -> dict[str, Station]:
-        return {s: v for s, v in stations.items() if self.has_station(s)}
+        accept = self._accept
+        return {s: v for s, v in stations.items() if accept(s)}
 
 
 @registered_filter
@@ -374,9 +445,12 @@ class CountryFilter(StationReductionFilter):
     :param exclude: countries to exclude, defaults to [], meaning none
     """
 
+    _cacheable = True
+
     def __init__(self, include: list[str] = [], exclude: list[str] = []):
-        self._include = set(include)
-        self._exclude = set(exclude)
+        self._include = frozenset(include)
+        self._exclude = frozenset(exclude)
+        self._accept = _include_exclude_test(self._include, self._exclude)
         return
 
     def init_kwargs(self):
@@ -386,15 +460,14 @@ class CountryFilter(StationReductionFilter):
         return "countries"
 
     def has_country(self, country) -> bool:
-        if len(self._include) > 0:
-            if country not in self._include:
-                return False
-        if country in self._exclude:
-            return False
-        return True
+        return self._accept(country)
 
     def filter_stations(self, stations: dict[str, Station]) -> dict[str, Station]:
-        return {s: v for s, v in stations.items() if self.has_country(v.country)}
+        if not (self._include or self._exclude):
+            # default initialized filter, no need to look at the stations
+            return stations
+        accept = self._accept
+        return {s: v for s, v in stations.items() if accept(v.country)}
 
 
 class BoundingBoxException(Exception):
@@ -413,20 +486,74 @@ class BoundingBoxFilter(StationReductionFilter):
     :raises BoundingBoxException: on any errors of the bounding boxes
     """
 
+    _cacheable = True
+
+    # maximum number of station x box elements tested at once
+    _max_mask_size = 2**20
+
     def __init__(
         self,
         include: list[tuple[float, float, float, float]] = [],
         exclude: list[tuple[float, float, float, float]] = [],
     ):
-        for tup in include:
-            self._test_bounding_box(tup)
-        for tup in exclude:
-            self._test_bounding_box(tup)
-
-        self._include = set(include)
-        self._exclude = set(exclude)
+        # boxes as (B, 4) NESW float arrays for vectorized station tests
+        self._include_arr = self._test_bounding_boxes(include)
+        self._exclude_arr = self._test_bounding_boxes(exclude)
+        self._include = frozenset(include)
+        self._exclude = frozenset(exclude)
+        self._has_location = self._location_test()
         return
 
+    def _location_test(self):
+        """Create the test-function for single locations, specialized for the
+        common cases without excludes and at most one include box.
+
+        :return: function of (latitude, longitude) returning True or False
+        """
+        if len(self._exclude_arr) == 0:
+            if len(self._include_arr) == 0:
+                return lambda latitude, longitude: True
+            if len(self._include_arr) == 1:
+                n, e, s, w = (float(x) for x in self._include_arr[0])
+                return lambda latitude, longitude: (
+                    s <= latitude <= n and w <= longitude <= e
+                )
+        return self._has_location_boxes
+
+    def _test_bounding_boxes(self, boxes) -> npt.NDArray[np.float64]:
+        """Test all bounding-boxes at once and convert them to an array
+
+        :param boxes: list of bounding-box tuples of form (north, east, south, west)
+        :raises BoundingBoxException: on any errors of the bounding boxes
+        :return: (B, 4) float array of the NESW boxes
+        """
+        boxes = list(boxes)
+        if len(boxes) == 0:
+            return np.empty((0, 4), dtype=np.float64)
+        try:
+            arr = np.asarray(boxes)
+        except ValueError:
+            arr = None
+        if (
+            arr is None
+            or arr.dtype.kind not in "iuf"
+            or arr.ndim != 2
+            or arr.shape[1] != 4
+        ):
+            # report the offending tuple
+            for tup in boxes:
+                self._test_bounding_box(tup)
+            raise BoundingBoxException(f"{boxes} are not NESW bounding-boxes")
+        arr = arr.astype(np.float64)
+
+        north, east, south, west = arr.T
+        valid = (-90 <= north) & (north <= 90) & (-90 <= south) & (south <= 90)
+        valid &= (-180 <= east) & (east <= 180) & (-180 <= west) & (west <= 180)
+        valid &= (south <= north) & (west <= east)
+        if not valid.all():
+            self._test_bounding_box(boxes[np.flatnonzero(~valid)[0]])
+        return arr
+
     def _test_bounding_box(self, tup):
         """_summary_
 
@@ -435,6 +562,8 @@ class BoundingBoxFilter(StationReductionFilter):
         """
         if len(tup) != 4:
             raise BoundingBoxException(f"({tup}) has not four NESW elements")
+        if not all(isinstance(x, numbers.Real) for x in tup):
+            raise BoundingBoxException(f"({tup}) has non-numeric elements")
         if not (-90 <= tup[0] <= 90):
             raise BoundingBoxException(f"north={tup[0]} not within [-90,90] in {tup}")
         if not (-90 <= tup[2] <= 90):
@@ -461,36 +590,58 @@ class BoundingBoxFilter(StationReductionFilter):
         :param latitude: latitude coordinate in degree_north [-90, 90]
         :param longitude: longitude coordinate in degree_east [-180, 180]
         """
-        if len(self._include) == 0:
-            inside_include = True
-        else:
-            inside_include = False
-            for n, e, s, w in self._include:
-                if not inside_include:  # one inside test is enough
-                    if s <= latitude <= n:
-                        if w <= longitude <= e:
-                            inside_include = True
-
-        if not inside_include:
-            return False  # no more tests required
-
-        outside_exclude = True
-        for n, e, s, w in self._exclude:
-            if (
-                outside_exclude
-            ):  # if known to be inside of any other exclude BB, no more tests
-                if s <= latitude <= n:
-                    if w <= longitude <= e:
-                        outside_exclude = False
-
-        return inside_include & outside_exclude
+        return self._has_location(latitude, longitude)
+
+    def _has_location_boxes(self, latitude, longitude):
+        """General implementation of has_location for any include and exclude boxes"""
+        # for a single location, short-circuiting over the tuples is faster than
+        # numpy on the few boxes; filter_stations uses the vectorized _in_boxes
+        if self._include and not any(
+            s <= latitude <= n and w <= longitude <= e for n, e, s, w in self._include
+        ):
+            return False
+        return not any(
+            s <= latitude <= n and w <= longitude <= e for n, e, s, w in self._exclude
+        )
+
+    @staticmethod
+    def _in_boxes(
+        lats: npt.NDArray[np.float64],
+        lons: npt.NDArray[np.float64],
+        boxes: npt.NDArray[np.float64],
+    ) -> npt.NDArray[np.bool_]:
+        """Test if the locations are inside of any of the NESW boxes
+
+        :param lats: latitudes in degree_north
+        :param lons: longitudes in degree_east
+        :param boxes: (B, 4) array of NESW bounding-boxes
+        :return: boolean array, True where the location is within at least one box
+        """
+        inside = np.zeros(len(lats), dtype=bool)
+        lats = lats[:, np.newaxis]
+        lons = lons[:, np.newaxis]
+        # broadcast over chunks of boxes, keeping the (S, B) masks bounded in size
+        step = max(1, BoundingBoxFilter._max_mask_size // max(1, len(lats)))
+        for i in range(0, len(boxes), step):
+            north, east, south, west = boxes[i : i + step].T
+            mask = (south <= lats) & (lats <= north) & (west <= lons) & (lons <= east)
+            inside |= np.any(mask, axis=1)
+        return inside
 
     def filter_stations(self, stations: dict[str, Station]) -> dict[str, Station]:
-        return {
-            s: v
-            for s, v in stations.items()
-            if self.has_location(v.latitude, v.longitude)
-        }
+        count = len(stations)
+        lats = np.fromiter(
+            (v.latitude for v in stations.values()), dtype=np.float64, count=count
+        )
+        lons = np.fromiter(
+            (v.longitude for v in stations.values()), dtype=np.float64, count=count
+        )
+        if len(self._include_arr) == 0:
+            mask = np.ones(count, dtype=bool)
+        else:
+            mask = self._in_boxes(lats, lons, self._include_arr)
+        mask &= ~self._in_boxes(lats, lons, self._exclude_arr)
+        return dict(itertools.compress(stations.items(), mask))
 
 
 @registered_filter
@@ -501,14 +652,20 @@ class FlagFilter(DataIndexFilter):
     :param exclude: flags to exclude, defaults to [], meaning none
     """
 
+    _cacheable = True
+
     def __init__(self, include: list[Flag] = [], exclude: list[Flag] = []):
-        self._include = set(include)
-        if len(include) == 0:
-            all_include = set([f for f in Flag])
-        else:
-            all_include = self._include
-        self._exclude = set(exclude)
-        self._valid = all_include.difference(self._exclude)
+        self._include = frozenset(include)
+        self._exclude = frozenset(exclude)
+        self._valid = (self._include or frozenset(Flag)) - self._exclude
+        # lookup-table by flag-value - offset, spanning all valid flags; the extra
+        # last entry (False) is used for all values outside of that range
+        valid = [int(f) for f in self._valid]
+        self._offset = min(valid, default=0)
+        self._valid_table = np.zeros(
+            max(valid, default=0) - self._offset + 2, dtype=np.bool_
+        )
+        self._valid_table[[f - self._offset for f in valid]] = True
         return
 
     def name(self):
@@ -523,14 +680,18 @@ class FlagFilter(DataIndexFilter):
     def filter_data_idx(
         self, data: Data, stations: dict[str, Station], variables: list[str]
     ):
-        validflags = np.fromiter(self._valid, dtype=data.flags.dtype)
-        index = np.isin(data.flags, validflags)
+        if data.flags.dtype.kind not in "iu":
+            # e.g. float flags, which might not be integral
+            return np.isin(data.flags, [int(f) for f in self._valid])
+        flags = data.flags.astype(np.intp, copy=False) - self._offset
+        np.clip(flags, -1, len(self._valid_table) - 1, out=flags)
+        index = self._valid_table[flags]
         return index
 
 
 # Upper and lower bound inclusive
 TimeBound = tuple[str | np.datetime64 | datetime, str | np.datetime64 | datetime]
-# Internal representation
+# Internal representation, datetime64[s]
 _TimeBound = tuple[np.datetime64, np.datetime64]
 
 
@@ -571,6 +732,8 @@ class TimeBoundsFilter(DataIndexFilter):
 
     """
 
+    _cacheable = True
+
     def __init__(
         self,
         start_include: list[TimeBound] = [],
@@ -586,21 +749,37 @@ class TimeBoundsFilter(DataIndexFilter):
         self._startend_exclude = self._timebounds_canonicalise(startend_exclude)
         self._end_include = self._timebounds_canonicalise(end_include)
         self._end_exclude = self._timebounds_canonicalise(end_exclude)
+        # bounds are not changed after construction
+        self._envelope = self._compute_envelope()
+        # (times1, times2, sorted includes, sorted excludes) for each bound-type
+        self._lookups = [
+            (
+                times1,
+                times2,
+                self._sort_timebounds(includes),
+                self._sort_timebounds(excludes),
+            )
+            for times1, times2, includes, excludes in (
+                ("start", "start", self._start_include, self._start_exclude),
+                ("start", "end", self._startend_include, self._startend_exclude),
+                ("end", "end", self._end_include, self._end_exclude),
+            )
+        ]
 
     def name(self):
         return "time_bounds"
 
+    def _parse_time(self, time: str | datetime | np.datetime64):
+        if isinstance(time, str):
+            return datetime.strptime(time, self.time_format)
+        return time
+
     def _timebounds_canonicalise(self, tuple_list: list[TimeBound]) -> list[_TimeBound]:
         retlist = []
         for start, end in tuple_list:
-            if isinstance(start, str):
-                start_dt = np.datetime64(datetime.strptime(start, self.time_format))
-            else:
-                start_dt = np.datetime64(start)
-            if isinstance(end, str):
-                end_dt = np.datetime64(datetime.strptime(end, self.time_format))
-            else:
-                end_dt = np.datetime64(end)
+            # all bounds in the resolution of Data.start_times/end_times
+            start_dt = np.datetime64(self._parse_time(start), "s")
+            end_dt = np.datetime64(self._parse_time(end), "s")
 
             if start_dt > end_dt:
                 raise TimeBoundsException(
@@ -626,57 +805,102 @@ class TimeBoundsFilter(DataIndexFilter):
             "start_exclude": self._datetime_list_to_str_list(self._start_exclude),
             "startend_include": self._datetime_list_to_str_list(self._startend_include),
             "startend_exclude": self._datetime_list_to_str_list(self._startend_exclude),
-            "end_include": self._datetime_list_to_str_list(self._startend_include),
-            "end_exclude": self._datetime_list_to_str_list(self._startend_exclude),
+            "end_include": self._datetime_list_to_str_list(self._end_include),
+            "end_exclude": self._datetime_list_to_str_list(self._end_exclude),
         }
 
-    def _index_from_include_exclude(
+    def _sort_timebounds(
+        self, tuple_list: list[_TimeBound]
+    ) -> tuple[npt.NDArray[np.datetime64], npt.NDArray[np.datetime64]]:
+        """Sort bounds by their start for lookups with searchsorted
+
+        :param tuple_list: bounds as (start, end)
+        :return: sorted starts and the running maximum of the corresponding ends
+        """
+        starts = np.array([s for s, _ in tuple_list], dtype="datetime64[s]")
+        ends = np.array([e for _, e in tuple_list], dtype="datetime64[s]")
+        order = np.argsort(starts, kind="stable")
+        return starts[order], np.maximum.accumulate(ends[order])
+
+    def _in_bounds(
         self,
         times1: npt.NDArray[np.datetime64],
         times2: npt.NDArray[np.datetime64],
-        includes: list[_TimeBound],
-        excludes: list[_TimeBound],
-    ):
-        if len(includes) == 0:
-            idx = np.repeat(True, len(times1))
-        else:
-            idx = np.repeat(False, len(times1))
-            for start, end in includes:
-                idx |= (start <= times1) & (times2 <= end)
+        sorted_bounds: tuple[npt.NDArray[np.datetime64], npt.NDArray[np.datetime64]],
+        out: npt.NDArray[np.bool_],
+    ) -> npt.NDArray[np.bool_]:
+        """Test if any bound fulfills start <= times1 and times2 <= end
 
-        for start, end in excludes:
-            idx &= (times1 < start) | (end < times2)
+        The last bound starting before times1 is found by bisection. Among all
+        bounds starting before times1, the latest end is then given by the running
+        maximum of the ends, so no loop over the bounds is needed.
 
-        return idx
+        :param times1: times compared to the start of the bounds
+        :param times2: times compared to the end of the bounds
+        :param sorted_bounds: bounds as returned from _sort_timebounds
+        :param out: boolean array to write the result to
+        :return: out
+        """
+        starts, max_ends = sorted_bounds
+        pos = np.searchsorted(starts, times1, side="right")
+        np.greater(pos, 0, out=out)
+        pos -= 1
+        np.maximum(pos, 0, out=pos)
+        out &= times2 <= max_ends[pos]
+        return out
+
+    def _reduce_index(
+        self,
+        idx: npt.NDArray[np.bool_],
+        hit: npt.NDArray[np.bool_],
+        times1: npt.NDArray[np.datetime64],
+        times2: npt.NDArray[np.datetime64],
+        includes: tuple[npt.NDArray[np.datetime64], npt.NDArray[np.datetime64]],
+        excludes: tuple[npt.NDArray[np.datetime64], npt.NDArray[np.datetime64]],
+    ) -> None:
+        """Reduce idx in-place to the times within includes and outside of excludes
+
+        :param idx: boolean index to update
+        :param hit: boolean work-array of the same size as idx
+        :param times1: times compared to the start of the bounds
+        :param times2: times compared to the end of the bounds
+        :param includes: sorted bounds to include, empty meaning all
+        :param excludes: sorted bounds to exclude
+        """
+        if len(includes[0]) > 0:
+            idx &= self._in_bounds(times1, times2, includes, out=hit)
+        if len(excludes[0]) > 0:
+            self._in_bounds(times1, times2, excludes, out=hit)
+            np.logical_not(hit, out=hit)
+            idx &= hit
+
+    def _compute_envelope(self) -> tuple[datetime, datetime] | None:
+        """Compute the envelope of all include bounds
+
+        :return: earliest start and latest end, or None without include bounds
+        """
+        all_bounds = self._start_include + self._startend_include + self._end_include
+        if len(all_bounds) == 0:
+            return None
+        start = min(s for s, _ in all_bounds)
+        end = max(e for _, e in all_bounds)
+        return (start.astype(datetime), end.astype(datetime))
 
     def has_envelope(self) -> bool:
         """Check if this filter has an envelope, i.e. a earliest and latest time"""
-        return bool(
-            len(self._start_include)
-            or len(self._startend_include)
-            or len(self._end_include)
-        )
+        return self._envelope is not None
 
     def envelope(self) -> tuple[datetime, datetime]:
         """Get the earliest and latest time possible for this filter.
 
         :return: earliest start and end-time (approximately)
-        :raises TimeBoundsException: if has_envelope() is False, or internal errors
+        :raises TimeBoundsException: if has_envelope() is False
         """
         if not self.has_envelope():
             raise TimeBoundsException(
                 "TimeBounds-envelope called but no envelope exists"
             )
-        start = np.datetime64(datetime.max)
-        end = np.datetime64(datetime.min)
-        for s, e in self._start_include + self._startend_include + self._end_include:
-            start = min(start, s)
-            end = max(end, e)
-        if end < start:
-            raise TimeBoundsException(
-                f"TimeBoundsEnvelope end < start: {end} < {start}"
-            )
-        return (start.astype(datetime), end.astype(datetime))
+        return self._envelope
 
     def contains(
         self, dt_start: npt.NDArray[np.datetime64], dt_end: npt.NDArray[np.datetime64]
@@ -687,21 +911,23 @@ class TimeBoundsFilter(DataIndexFilter):
         :param dt_end: end of each observation as a numpy array of datetimes
         :return: numpy boolean array with True/False values
         """
-        idx = self._index_from_include_exclude(
-            dt_start, dt_start, self._start_include, self._start_exclude
-        )
-        idx &= self._index_from_include_exclude(
-            dt_start, dt_end, self._startend_include, self._startend_exclude
-        )
-        idx &= self._index_from_include_exclude(
-            dt_end, dt_end, self._end_include, self._end_exclude
-        )
+        times = {"start": dt_start, "end": dt_end}
+        idx = np.ones(len(dt_start), dtype=np.bool_)
+        hit = np.empty_like(idx)
+        for times1, times2, includes, excludes in self._lookups:
+            self._reduce_index(
+                idx, hit, times[times1], times[times2], includes, excludes
+            )
         return idx
 
     def filter_data_idx(
         self, data: Data, stations: dict[str, Station], variables: list[str]
     ) -> npt.NDArray[np.bool_]:
-        return self.contains(data.start_times, data.end_times)
+        # no-op for datetime64[s] columns, but avoids per-element comparisons of
+        # readers returning e.g. object arrays of datetimes
+        dt_start = np.asarray(data.start_times, dtype="datetime64[s]")
+        dt_end = np.asarray(data.end_times, dtype="datetime64[s]")
+        return self.contains(dt_start, dt_end)
 
 
 @registered_filter
@@ -786,9 +1012,7 @@ class TimeVariableStationFilter(DataIndexFilter):
                 start_time_dt = datetime.strptime(start_time, self.time_format)
                 for end_time, stations in end_times.items():
                     end_time_dt = datetime.strptime(end_time, self.time_format)
-                    dstations = data.stations
-                    stat_names = np.fromiter(stations, dtype=dstations.dtype)
-                    exclude_idx = np.isin(dstations, stat_names)
+                    exclude_idx = _station_index(data, set(stations))
                     exclude_idx &= (start_time_dt <= data.start_times) & (
                         end_time_dt > data.start_times
                     )
@@ -808,14 +1032,16 @@ class DuplicateFilter(DataIndexFilter):
 
     default_keys = ["stations", "start_times", "end_times"]
 
+    _cacheable = True
+
     def __init__(self, duplicate_keys: list[str] | None = None):
-        self._keys = duplicate_keys
+        self._keys = None if duplicate_keys is None else list(duplicate_keys)
 
     def init_kwargs(self):
         if self._keys is None:
             return {}
         else:
-            return {"duplicate_keys": self._keys}
+            return {"duplicate_keys": list(self._keys)}
 
     def name(self):
         return "duplicates"
@@ -858,8 +1084,10 @@ class TimeResolutionFilter(DataIndexFilter):
         year=(360 * 24 * 60 * 60, 370 * 24 * 60 * 60),
     )
 
+    _cacheable = True
+
     def __init__(self, resolutions: list[str] = []):
-        self._resolutions = resolutions
+        self._resolutions = list(resolutions)
         self._minmax = self._resolve_resolutions()
 
     def _resolve_resolutions(self):
@@ -881,7 +1109,7 @@ class TimeResolutionFilter(DataIndexFilter):
         if len(self._resolutions) == 0:
             return {}
         else:
-            return {"resolutions": self._resolutions}
+            return {"resolutions": list(self._resolutions)}
 
     def name(self):
         return "time_resolution"
@@ -913,6 +1141,8 @@ class AltitudeFilter(StationReductionFilter):
     If station elevation is nan, it is always excluded.
     """
 
+    _cacheable = True
+
     def __init__(
         self, min_altitude: float | None = None, max_altitude: float | None = None
     ):
@@ -993,6 +1223,9 @@ class RelativeAltitudeFilter(StationFilter):
         ["degrees_east", "degree_east", "degree_E", "degrees_E", "degreeE", "degreesE"]
     )
 
+    # topography is read lazily from topo_file
+    _cacheable = False
+
     def __init__(
         self,
         topo_file: str | None = None,
@@ -1258,6 +1491,9 @@ class ValleyFloorRelativeAltitudeFilter(StationFilter):
     ```
     """
 
+    # the topography file is selected while filtering
+    _cacheable = False
+
     def __init__(
         self,
         topo: str | None = None,
@@ -1,5 +1,9 @@
+import numpy as np
+
 from .Reader import Reader
 from .Data import Data
+from .Station import Station
+from .AutoFilterReaderEngine import AutoFilterReader
 
 
 class VariableNameChangingReader(Reader):
@@ -60,3 +64,53 @@ class VariableNameChangingReader(Reader):
 
     def close(self):
         self._reader.close()
+
+
+class FilteringReader(AutoFilterReader):
+    """A pyaro.timeseries.Reader wrapper applying filters to an already opened
+    Reader, e.g. to use differently filtered views of the same data without
+    reading it again. Example:
+
+        ts = pyaro.open_timeseries("csv_timeseries", file, filters=[])
+        no_station1 = FilteringReader(ts, {"stations": {"exclude": ["station1"]}})
+        for var in no_station1.variables():
+            print(var, no_station1.data(var))
+
+    """
+
+    def __init__(self, reader: Reader, filters):
+        """Initialize the filters on the Reader
+
+        :param reader: The Reader instance to filter
+        :param filters: list of filters, or dict of (name, kwargs) for FilterFactory
+        """
+        self._reader = reader
+        self._set_filters(filters)
+
+        return
+
+    @property
+    def reader(self):
+        """Return the original reader
+
+        :return: original reader without modifications, see __init__
+        """
+        return self._reader
+
+    def _unfiltered_data(self, varname) -> Data:
+        # filters may change the data-object, e.g. the variable name, so use a copy
+        # to keep the data of the wrapped reader unchanged
+        data = self._reader.data(varname)
+        return data.slice(np.ones(len(data), dtype=bool))
+
+    def _unfiltered_stations(self) -> dict[str, Station]:
+        return self._reader.stations()
+
+    def _unfiltered_variables(self) -> list[str]:
+        return self._reader.variables()
+
+    def metadata(self):
+        return self._reader.metadata()
+
+    def close(self):
+        self._reader.close()
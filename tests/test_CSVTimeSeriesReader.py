@@ -1,106 +1,371 @@
 import datetime
+import importlib.util
 import logging
+import pathlib
 import sys
-import unittest
-import os
 
-import numpy as np
+import pytest
 import pyaro
 import pyaro.timeseries
 from pyaro.timeseries.Filter import FilterException
-from pyaro.timeseries.Wrappers import VariableNameChangingReader
+from pyaro.timeseries.Wrappers import FilteringReader, VariableNameChangingReader
 
-try:
-    import pandas
+# only look for the optional packages, they are imported by the tests using them
+has_pandas = importlib.util.find_spec("pandas") is not None
+has_geocode = importlib.util.find_spec("geocoder_reverse_natural_earth") is not None
 
-    has_pandas = True
-except:
-    has_pandas = False
 
-try:
-    import geocoder_reverse_natural_earth
+# test-data paths, resolved once at import
+TESTDATA = pathlib.Path(__file__).resolve().parent / "testdata"
+FILE = str(TESTDATA / "datadir" / "csvReader_testdata.csv")
+ELEVATION_FILE = str(
+    TESTDATA / "datadir_elevation" / "csvReader_testdata_elevation.csv"
+)
+MULTIFILE = "glob:" + str(TESTDATA / "datadir" / "**/*.csv")
+MULTIFILE_DIR = str(TESTDATA / "datadir")
+TOPOGRAPHY_FILE = str(TESTDATA / "datadir_elevation" / "topography.nc")
+GTOPO30_FILE = str(TESTDATA / "datadir_elevation" / "gtopo30_subset.nc")
+
+
+@pytest.fixture(scope="session")
+def engine():
+    return pyaro.list_timeseries_engines()["csv_timeseries"]
+
+
+@pytest.fixture(scope="session")
+def reader(engine):
+    """Reader of FILE without filters, parsed once per (xdist-worker) session and
+    shared read-only by the tests"""
+    with engine.open(FILE, filters=[]) as ts:
+        yield ts
+
+
+@pytest.fixture(autouse=True)
+def debug_logging():
+    logging.basicConfig(stream=sys.stdout, level=logging.DEBUG)
+    logging.getLogger().setLevel(logging.DEBUG)
+
+
+def _data_count(ts) -> int:
+    """Number of data-points of all variables in a reader"""
+    ts_data = ts.data
+    return sum(len(ts_data(v)) for v in tuple(ts.variables()))
+
+
+def test_engine_metadata(engine):
+    assert engine.url() == "https://github.com/metno/pyaro"
+    # just see that it doesn't fails
+    engine.description()
+    engine.args()
+
+
+def test_basic_read(reader):
+    assert (_data_count(reader), len(reader.stations())) == (208, 2)
+
+
+def test_init_multifile(engine):
+    with engine.open(MULTIFILE, filters=[]) as ts:
+        count = _data_count(ts)
+        assert count == 426
+        assert len(ts.stations()) == 2
+
+
+def test_init_directory(engine):
+    with engine.open(MULTIFILE_DIR, filters=[]) as ts:
+        count = _data_count(ts)
+        assert count == 218
+        assert len(ts.stations()) == 2
+
+
+def test_init2():
+    with pyaro.open_timeseries("csv_timeseries", *[FILE], **{"filters": []}) as ts:
+        count = _data_count(ts)
+        assert count == 208
+        assert len(ts.stations()) == 2
+
+
+def test_init_extra_columns():
+    columns = {
+        "variable": 0,
+        "station": 1,
+        "longitude": 2,
+        "latitude": 3,
+        "value": 4,
+        "units": 5,
+        "start_time": 6,
+        "end_time": 7,
+        "altitude": "0",
+        "country": "NO",
+        "standard_deviation": "NaN",
+        "flag": "0",
+        "area_classification": 8,
+    }
+    with pyaro.open_timeseries(
+        "csv_timeseries", *[FILE], **{"filters": [], "columns": columns}
+    ) as ts:
+        areas = ["Rural", "Urban"]
+        stations = ts.stations()
+        assert stations["station1"]["area_classification"] == areas[0]
+        assert stations["station2"]["area_classification"] == areas[1]
+
+
+def test_metadata(reader):
+    assert isinstance(reader.metadata(), dict)
+    assert "path" in reader.metadata()
+
+
+def test_data(engine):
+    with engine.open(
+        filename=FILE,
+        filters=[pyaro.timeseries.filters.get("countries", include=["NO"])],
+    ) as ts:
+        for var in ts.variables():
+            # every ts.data call applies all filters again, so retrieve it once
+            data = ts.data(var)
+            for column in (
+                data.stations,
+                data.start_times,
+                data.end_times,
+                data.latitudes,
+                data.longitudes,
+                data.altitudes,
+                data.values,
+                data.flags,
+            ):
+                assert len(column) == len(data)
+
+
+def test_append_data(engine):
+    with engine.open(
+        filename=FILE,
+        filters={"countries": {"include": ["NO"]}},
+    ) as ts:
+        var = next(iter(ts.variables()))
+        data = ts.data(var)
+        old_size = len(data)
+        rounds = 3
+        for _ in range(rounds):
+            data.append(
+                value=data.values,
+                station=data.stations,
+                start_time=data.start_times,
+                end_time=data.end_times,
+                latitude=data.latitudes,
+                longitude=data.longitudes,
+                altitude=data.altitudes,
+                flag=data.flags,
+                standard_deviation=data.standard_deviations,
+            )
+        assert (2**rounds) * old_size == len(data), "data append by array"
+
+
+def test_stationfilter(reader):
+    sfilter = pyaro.timeseries.filters.get("stations", exclude=["station1"])
+    ts = FilteringReader(reader, [sfilter])
+    assert (_data_count(ts), len(ts.stations())) == (104, 1)
+
+
+def test_filtering_reader(reader):
+    ts = FilteringReader(
+        reader,
+        {
+            "variables": {"reader_to_new": {"SOx": "oxidised_sulphur"}},
+            "stations": {"exclude": ["station1"]},
+        },
+    )
+    assert "oxidised_sulphur" in ts.variables()
+    data = ts.data("oxidised_sulphur")
+    assert data.variable == "oxidised_sulphur"
+    assert set(data.stations) == {"station2"}
+    # the wrapped reader is unchanged
+    assert reader.data("SOx").variable == "SOx"
+    assert (_data_count(reader), len(reader.stations())) == (208, 2)
+
+
+def test_boundingboxfilter_exception():
+    with pytest.raises(pyaro.timeseries.Filter.BoundingBoxException):
+        pyaro.timeseries.filters.get("bounding_boxes", include=[(-90, 0, 90, 180)])
+
+
+@pytest.mark.parametrize(
+    "kind,box", [("include", (90, 180, -90, 0)), ("exclude", (90, 0, -90, -180))]
+)
+def test_boundingboxfilter(reader, kind, box):
+    sfilter = pyaro.timeseries.filters.get("bounding_boxes", **{kind: [box]})
+    assert sfilter.init_kwargs()[kind][0][3] == box[3]
+    ts = FilteringReader(reader, [sfilter])
+    assert (_data_count(ts), len(ts.stations())) == (104, 1)
 
-    has_geocode = True
-except:
-    has_geocode = False
+
+def test_timebounds_exception():
+    with pytest.raises(pyaro.timeseries.Filter.TimeBoundsException):
+        pyaro.timeseries.filters.get(
+            "time_bounds",
+            start_include=[("1903-01-01 00:00:00", "1901-12-31 23:59:59")],
+        )
 
 
-class TestCSVTimeSeriesReader(unittest.TestCase):
-    file = os.path.join(
-        os.path.dirname(os.path.realpath(__file__)),
-        "testdata",
-        "datadir",
-        "csvReader_testdata.csv",
+def test_timebounds(reader):
+    tfilter = pyaro.timeseries.filters.get(
+        "time_bounds",
+        startend_include=[("1997-01-01 00:00:00", "1997-02-01 00:00:00")],
+        end_exclude=[("1997-01-05 00:00:00", "1997-01-07 00:00:00")],
     )
-    elevation_file = os.path.join(
-        os.path.dirname(os.path.realpath(__file__)),
-        "testdata",
-        "datadir_elevation",
-        "csvReader_testdata_elevation.csv",
+    assert tfilter.init_kwargs()["startend_include"][0][1] == "1997-02-01 00:00:00"
+    dt1, dt2 = tfilter.envelope()
+    assert isinstance(dt1, datetime.datetime)
+    assert isinstance(dt2, datetime.datetime)
+    ts = FilteringReader(reader, [tfilter])
+    assert (_data_count(ts), len(ts.stations())) == (112, 2)
+
+
+def test_flagfilter(reader):
+    ffilter = pyaro.timeseries.filters.get(
+        "flags",
+        include=[
+            pyaro.timeseries.Flag.VALID,
+            pyaro.timeseries.Flag.BELOW_THRESHOLD,
+        ],
     )
-    multifile = "glob:" + os.path.join(
-        os.path.dirname(os.path.realpath(__file__)), "testdata", "datadir", "**/*.csv"
+    assert ffilter.init_kwargs()["include"][0] == pyaro.timeseries.Flag.VALID
+    ts = FilteringReader(reader, [ffilter])
+    assert (_data_count(ts), len(ts.stations())) == (208, 2)
+
+    ffilter = pyaro.timeseries.filters.get(
+        "flags", include=[pyaro.timeseries.Flag.INVALID]
     )
-    multifile_dir = os.path.join(
-        os.path.dirname(os.path.realpath(__file__)), "testdata", "datadir"
+    ts = FilteringReader(reader, [ffilter])
+    assert (_data_count(ts), len(ts.stations())) == (0, 2)
+
+
+def test_variable_time_station_filter(reader):
+    vtsfilter = pyaro.timeseries.filters.get(
+        "time_variable_station",
+        exclude=[
+            # excluding 2 days each
+            ("1997-01-11 00:00:00", "1997-01-12 23:59:59", "SOx", "station2"),
+            ("1997-01-13 00:00:00", "1997-01-14 23:59:59", "NOx", "station1"),
+        ],
     )
+    assert vtsfilter.init_kwargs()["exclude"][0][0] == "1997-01-11 00:00:00"
+    ts = FilteringReader(reader, [vtsfilter])
+    assert (_data_count(ts), len(ts.stations())) == (204, 2)
+
+
+def test_variable_time_station_filter_csv(reader):
+    csvfile = str(TESTDATA / "timeVariableStationFilter_exclude.csv")
 
-    def setUp(self):
-        logging.basicConfig(stream=sys.stdout, level=logging.DEBUG)
-        logging.getLogger().setLevel(logging.DEBUG)
-        pass
-
-    def test_init(self):
-        engine = pyaro.list_timeseries_engines()["csv_timeseries"]
-        self.assertEqual(engine.url(), "https://github.com/metno/pyaro")
-        # just see that it doesn't fails
-        engine.description()
-        engine.args()
-        with engine.open(self.file, filters=[]) as ts:
-            count = 0
-            for var in ts.variables():
-                count += len(ts.data(var))
-            self.assertEqual(count, 208)
-            self.assertEqual(len(ts.stations()), 2)
-
-    def test_init_multifile(self):
-        engine = pyaro.list_timeseries_engines()["csv_timeseries"]
-        self.assertEqual(engine.url(), "https://github.com/metno/pyaro")
-        # just see that it doesn't fails
-        engine.description()
-        engine.args()
-        with engine.open(self.multifile, filters=[]) as ts:
-            count = 0
-            for var in ts.variables():
-                count += len(ts.data(var))
-            self.assertEqual(count, 426)
-            self.assertEqual(len(ts.stations()), 2)
-
-    def test_init_directory(self):
-        engine = pyaro.list_timeseries_engines()["csv_timeseries"]
-        self.assertEqual(engine.url(), "https://github.com/metno/pyaro")
-        # just see that it doesn't fails
-        engine.description()
-        engine.args()
-        with engine.open(self.multifile_dir, filters=[]) as ts:
-            count = 0
-            for var in ts.variables():
-                count += len(ts.data(var))
-            self.assertEqual(count, 218)
-            self.assertEqual(len(ts.stations()), 2)
-
-    def test_init2(self):
-        with pyaro.open_timeseries(
-            "csv_timeseries", *[self.file], **{"filters": []}
+    vtsfilter = pyaro.timeseries.filters.get(
+        "time_variable_station",
+        exclude_from_csvfile=csvfile,
+    )
+    print(vtsfilter)
+    assert vtsfilter.init_kwargs()["exclude"][0][0] == "1997-01-11 00:00:00"
+    ts = FilteringReader(reader, [vtsfilter])
+    assert (_data_count(ts), len(ts.stations())) == (204, 2)
+
+
+def test_wrappers(engine):
+    newsox = "oxidised_sulphur"
+    with VariableNameChangingReader(
+        engine.open(FILE, filters=[]), {"SOx": newsox}
+    ) as ts:
+        assert ts.data(newsox).variable == newsox
+        assert len(ts.metadata()) > 0
+    pass
+
+
+def test_variables_filter(engine):
+    newsox = "oxidised_sulphur"
+    vfilter = pyaro.timeseries.filters.get("variables", reader_to_new={"SOx": newsox})
+    with engine.open(FILE, filters=[vfilter]) as ts:
+        assert ts.data(newsox).variable == newsox
+    pass
+
+
+def test_duplicate_filter(engine):
+    with engine.open(
+        MULTIFILE_DIR + "/csvReader_testdata2.csv",
+        filters={"duplicates": {"duplicate_keys": None}},
+    ) as ts:
+        assert len(ts.data("NOx")) == 8
+    with engine.open(
+        MULTIFILE_DIR + "/csvReader_testdata2.csv",
+        filters={
+            "duplicates": {"duplicate_keys": ["stations", "start_times", "values"]}
+        },
+    ) as ts:
+        assert len(ts.data("NOx")) == 10
+
+
+def test_time_resolution_filter(engine):
+    with pytest.raises(FilterException):
+        with engine.open(
+            FILE,
+            filters={"time_resolution": {"resolutions": ["ldjf4098"]}},
         ) as ts:
-            count = 0
-            for var in ts.variables():
-                count += len(ts.data(var))
-            self.assertEqual(count, 208)
-            self.assertEqual(len(ts.stations()), 2)
-
-    def test_init_extra_columns(self):
-        columns = {
+            pass
+    with engine.open(
+        FILE,
+        filters={"time_resolution": {"resolutions": ["1 day"]}},
+    ) as ts:
+        count = _data_count(ts)
+        assert count == 208
+    for resolution in "1 minute, 1 hour, 1week, 1month, 3year".split(","):
+        with engine.open(
+            FILE,
+            filters={"time_resolution": {"resolutions": ["1 hour"]}},
+        ) as ts:
+            count = _data_count(ts)
+            assert count == 0
+
+
+def test_filterFactory():
+    filters = pyaro.timeseries.filters.list()
+    print(filters["variables"])
+    assert True
+
+
+def test_filterCollection(reader):
+    filters = pyaro.timeseries.FilterCollection(
+        {
+            "countries": {"include": ["NO"]},
+            "stations": {"include": ["station1"]},
+        }
+    )
+    data1 = reader.data("SOx")
+    data2 = filters.filter(reader, "SOx")
+    assert len(data1) == 2 * len(data2)
+
+
+@pytest.mark.skipif(not has_pandas, reason="no pandas installed")
+def test_timeseries_data_to_pd(reader):
+    vars = list(reader.variables())
+    data = reader.data(vars[0])
+    df = pyaro.timeseries_data_to_pd(data)
+    assert len(df) == len(data)
+    assert len(df["values"]) == len(data["values"])
+    assert df["values"][3] == data["values"][3]
+
+
+@pytest.mark.skipif(
+    not has_geocode, reason="geocode-reverse-natural-earth not available"
+)
+def test_country_lookup():
+    with pyaro.open_timeseries(
+        "csv_timeseries", *[FILE], **{"filters": [], "country_lookup": True}
+    ) as ts:
+        count = 0
+        vars = list(ts.variables())
+        data = ts.data(vars[0])
+    assert False
+
+
+def test_altitude_filter_1(engine):
+    with engine.open(
+        filename=ELEVATION_FILE,
+        filters=[pyaro.timeseries.filters.get("altitude", max_altitude=150)],
+        columns={
             "variable": 0,
             "station": 1,
             "longitude": 2,
@@ -109,574 +374,278 @@ class TestCSVTimeSeriesReader(unittest.TestCase):
             "units": 5,
             "start_time": 6,
             "end_time": 7,
-            "altitude": "0",
+            "altitude": 9,
             "country": "NO",
             "standard_deviation": "NaN",
             "flag": "0",
-            "area_classification": 8,
-        }
-        with pyaro.open_timeseries(
-            "csv_timeseries", *[self.file], **{"filters": [], "columns": columns}
-        ) as ts:
-            areas = ["Rural", "Urban"]
-            stations = ts.stations()
-            self.assertEqual(stations["station1"]["area_classification"], areas[0])
-            self.assertEqual(stations["station2"]["area_classification"], areas[1])
-
-    def test_metadata(self):
-        with pyaro.open_timeseries(
-            "csv_timeseries", *[self.file], **{"filters": []}
-        ) as ts:
-            self.assertIsInstance(ts.metadata(), dict)
-            self.assertIn("path", ts.metadata())
-
-    def test_data(self):
-        engines = pyaro.list_timeseries_engines()
-        with engines["csv_timeseries"].open(
-            filename=self.file,
-            filters=[pyaro.timeseries.filters.get("countries", include=["NO"])],
-        ) as ts:
-            for var in ts.variables():
-                # stations
-                ts.data(var).stations
-                # start_times
-                ts.data(var).start_times
-                # stop_times
-                ts.data(var).end_times
-                # latitudes
-                ts.data(var).latitudes
-                # longitudes
-                ts.data(var).longitudes
-                # altitudes
-                ts.data(var).altitudes
-                # values
-                ts.data(var).values
-                # flags
-                ts.data(var).flags
-        self.assertTrue(True)
-
-    def test_append_data(self):
-        engines = pyaro.list_timeseries_engines()
-        with engines["csv_timeseries"].open(
-            filename=self.file,
-            filters={"countries": {"include": ["NO"]}},
-        ) as ts:
-            var = next(iter(ts.variables()))
-            data = ts.data(var)
-            old_size = len(data)
-            rounds = 3
-            for _ in range(rounds):
-                data.append(
-                    value=data.values,
-                    station=data.stations,
-                    start_time=data.start_times,
-                    end_time=data.end_times,
-                    latitude=data.latitudes,
-                    longitude=data.longitudes,
-                    altitude=data.altitudes,
-                    flag=data.flags,
-                    standard_deviation=data.standard_deviations,
-                )
-            self.assertEqual(
-                (2**rounds) * old_size, len(data), "data append by array"
-            )
+        },
+    ) as ts:
+        assert len(ts.stations()) == 1
 
-    def test_stationfilter(self):
-        engine = pyaro.list_timeseries_engines()["csv_timeseries"]
-        sfilter = pyaro.timeseries.filters.get("stations", exclude=["station1"])
-        with engine.open(self.file, filters=[sfilter]) as ts:
-            count = 0
-            for var in ts.variables():
-                count += len(ts.data(var))
-            self.assertEqual(count, 104)
-            self.assertEqual(len(ts.stations()), 1)
-
-    def test_boundingboxfilter_exception(self):
-        with self.assertRaises(pyaro.timeseries.Filter.BoundingBoxException):
-            pyaro.timeseries.filters.get("bounding_boxes", include=[(-90, 0, 90, 180)])
-
-    def test_boundingboxfilter(self):
-        engine = pyaro.list_timeseries_engines()["csv_timeseries"]
-        sfilter = pyaro.timeseries.filters.get(
-            "bounding_boxes", include=[(90, 180, -90, 0)]
-        )
-        self.assertEqual(sfilter.init_kwargs()["include"][0][3], 0)
-        with engine.open(self.file, filters=[sfilter]) as ts:
-            count = 0
-            for var in ts.variables():
-                count += len(ts.data(var))
-            self.assertEqual(len(ts.stations()), 1)
-            self.assertEqual(count, 104)
-        sfilter = pyaro.timeseries.filters.get(
-            "bounding_boxes", exclude=[(90, 0, -90, -180)]
-        )
-        self.assertEqual(sfilter.init_kwargs()["exclude"][0][3], -180)
-        with engine.open(self.file, filters=[sfilter]) as ts:
-            count = 0
-            for var in ts.variables():
-                count += len(ts.data(var))
-            self.assertEqual(len(ts.stations()), 1)
-            self.assertEqual(count, 104)
-
-    def test_timebounds_exception(self):
-        with self.assertRaises(pyaro.timeseries.Filter.TimeBoundsException):
+
+def test_altitude_filter_2(engine):
+    with engine.open(
+        filename=ELEVATION_FILE,
+        filters=[pyaro.timeseries.filters.get("altitude", min_altitude=250)],
+        columns={
+            "variable": 0,
+            "station": 1,
+            "longitude": 2,
+            "latitude": 3,
+            "value": 4,
+            "units": 5,
+            "start_time": 6,
+            "end_time": 7,
+            "altitude": 9,
+            "country": "NO",
+            "standard_deviation": "NaN",
+            "flag": "0",
+        },
+    ) as ts:
+        assert len(ts.stations()) == 1
+
+
+def test_altitude_filter_3(engine):
+    with engine.open(
+        filename=ELEVATION_FILE,
+        filters=[
+            pyaro.timeseries.filters.get("altitude", min_altitude=150, max_altitude=250)
+        ],
+        columns={
+            "variable": 0,
+            "station": 1,
+            "longitude": 2,
+            "latitude": 3,
+            "value": 4,
+            "units": 5,
+            "start_time": 6,
+            "end_time": 7,
+            "altitude": 9,
+            "country": "NO",
+            "standard_deviation": "NaN",
+            "flag": "0",
+        },
+    ) as ts:
+        assert len(ts.stations()) == 1
+
+
+def test_relaltitude_filter_emep_1(engine):
+    with engine.open(
+        filename=ELEVATION_FILE,
+        filters=[
             pyaro.timeseries.filters.get(
-                "time_bounds",
-                start_include=[("1903-01-01 00:00:00", "1901-12-31 23:59:59")],
+                "relaltitude",
+                topo_file=TOPOGRAPHY_FILE,
+                rdiff=0,
             )
+        ],
+        columns={
+            "variable": 0,
+            "station": 1,
+            "longitude": 2,
+            "latitude": 3,
+            "value": 4,
+            "units": 5,
+            "start_time": 6,
+            "end_time": 7,
+            "altitude": 9,
+            "country": "NO",
+            "standard_deviation": "NaN",
+            "flag": "0",
+        },
+    ) as ts:
+        # Altitudes in test dataset:
+        # Station     | Alt_obs   | Modeobs | rdiff |
+        # Station 1   | 100       | 12.2554 |  87.7446 |
+        # Station 2   | 200       |  4.9016 | 195.0984 |
+        # Station 3   | 300       |  4.9016 | 195.0984 |
+        # Since rtol = 0, no station should be included.
+        assert len(ts.stations()) == 0
+
+
+def test_relaltitude_filter_emep_2(engine):
+    with engine.open(
+        filename=ELEVATION_FILE,
+        filters=[
+            pyaro.timeseries.filters.get(
+                "relaltitude",
+                topo_file=TOPOGRAPHY_FILE,
+                rdiff=90,
+            )
+        ],
+        columns={
+            "variable": 0,
+            "station": 1,
+            "longitude": 2,
+            "latitude": 3,
+            "value": 4,
+            "units": 5,
+            "start_time": 6,
+            "end_time": 7,
+            "altitude": 9,
+            "country": "NO",
+            "standard_deviation": "NaN",
+            "flag": "0",
+        },
+    ) as ts:
+        # At rdiff = 90, only the first station should be included.
+        assert len(ts.stations()) == 1
 
-    def test_timebounds(self):
-        engine = pyaro.list_timeseries_engines()["csv_timeseries"]
-        tfilter = pyaro.timeseries.filters.get(
-            "time_bounds",
-            startend_include=[("1997-01-01 00:00:00", "1997-02-01 00:00:00")],
-            end_exclude=[("1997-01-05 00:00:00", "1997-01-07 00:00:00")],
-        )
-        self.assertEqual(
-            tfilter.init_kwargs()["startend_include"][0][1], "1997-02-01 00:00:00"
-        )
-        (dt1, dt2) = tfilter.envelope()
-        self.assertIsInstance(dt1, datetime.datetime)
-        self.assertIsInstance(dt2, datetime.datetime)
-        with engine.open(self.file, filters=[tfilter]) as ts:
-            count = 0
-            for var in ts.variables():
-                count += len(ts.data(var))
-            self.assertEqual(len(ts.stations()), 2)
-            self.assertEqual(count, 112)
-
-    def test_flagfilter(self):
-        engine = pyaro.list_timeseries_engines()["csv_timeseries"]
-        ffilter = pyaro.timeseries.filters.get(
-            "flags",
-            include=[
-                pyaro.timeseries.Flag.VALID,
-                pyaro.timeseries.Flag.BELOW_THRESHOLD,
-            ],
-        )
-        self.assertEqual(
-            ffilter.init_kwargs()["include"][0], pyaro.timeseries.Flag.VALID
-        )
-        with engine.open(self.file, filters=[ffilter]) as ts:
-            count = 0
-            for var in ts.variables():
-                count += len(ts.data(var))
-            self.assertEqual(len(ts.stations()), 2)
-            self.assertEqual(count, 208)
-
-        ffilter = pyaro.timeseries.filters.get(
-            "flags", include=[pyaro.timeseries.Flag.INVALID]
-        )
-        with engine.open(self.file, filters=[ffilter]) as ts:
-            count = 0
-            for var in ts.variables():
-                count += len(ts.data(var))
-            self.assertEqual(len(ts.stations()), 2)
-            self.assertEqual(count, 0)
-
-    def test_variable_time_station_filter(self):
-        vtsfilter = pyaro.timeseries.filters.get(
-            "time_variable_station",
-            exclude=[
-                # excluding 2 days each
-                ("1997-01-11 00:00:00", "1997-01-12 23:59:59", "SOx", "station2"),
-                ("1997-01-13 00:00:00", "1997-01-14 23:59:59", "NOx", "station1"),
-            ],
-        )
-        self.assertEqual(
-            vtsfilter.init_kwargs()["exclude"][0][0], "1997-01-11 00:00:00"
-        )
-        engine = pyaro.list_timeseries_engines()["csv_timeseries"]
-        with engine.open(self.file, filters=[vtsfilter]) as ts:
-            count = 0
-            for var in ts.variables():
-                count += len(ts.data(var))
-            self.assertEqual(len(ts.stations()), 2)
-            self.assertEqual(count, 204)
-
-    def test_variable_time_station_filter_csv(self):
-        csvfile = os.path.join(
-            os.path.dirname(os.path.realpath(__file__)),
-            "testdata",
-            "timeVariableStationFilter_exclude.csv",
-        )
 
-        vtsfilter = pyaro.timeseries.filters.get(
-            "time_variable_station",
-            exclude_from_csvfile=csvfile,
-        )
-        print(vtsfilter)
-        self.assertEqual(
-            vtsfilter.init_kwargs()["exclude"][0][0], "1997-01-11 00:00:00"
-        )
-        engine = pyaro.list_timeseries_engines()["csv_timeseries"]
-        with engine.open(self.file, filters=[vtsfilter]) as ts:
-            count = 0
-            for var in ts.variables():
-                count += len(ts.data(var))
-            self.assertEqual(len(ts.stations()), 2)
-            self.assertEqual(count, 204)
-
-    def test_wrappers(self):
-        engine = pyaro.list_timeseries_engines()["csv_timeseries"]
-        newsox = "oxidised_sulphur"
-        with VariableNameChangingReader(
-            engine.open(self.file, filters=[]), {"SOx": newsox}
-        ) as ts:
-            self.assertEqual(ts.data(newsox).variable, newsox)
-            self.assertGreater(len(ts.metadata()), 0)
-        pass
-
-    def test_variables_filter(self):
-        engine = pyaro.list_timeseries_engines()["csv_timeseries"]
-        newsox = "oxidised_sulphur"
-        vfilter = pyaro.timeseries.filters.get(
-            "variables", reader_to_new={"SOx": newsox}
-        )
-        with engine.open(self.file, filters=[vfilter]) as ts:
-            self.assertEqual(ts.data(newsox).variable, newsox)
-        pass
+def test_relaltitude_filter_emep_3(engine):
+    with engine.open(
+        filename=ELEVATION_FILE,
+        filters=[
+            pyaro.timeseries.filters.get(
+                "relaltitude",
+                topo_file=TOPOGRAPHY_FILE,
+                rdiff=300,
+            )
+        ],
+        columns={
+            "variable": 0,
+            "station": 1,
+            "longitude": 2,
+            "latitude": 3,
+            "value": 4,
+            "units": 5,
+            "start_time": 6,
+            "end_time": 7,
+            "altitude": 9,
+            "country": "NO",
+            "standard_deviation": "NaN",
+            "flag": "0",
+        },
+    ) as ts:
+        # Since rdiff=300, all stations should be included.
+        assert len(ts.stations()) == 3
 
-    def test_duplicate_filter(self):
-        engine = pyaro.list_timeseries_engines()["csv_timeseries"]
-        with engine.open(
-            self.multifile_dir + "/csvReader_testdata2.csv",
-            filters={"duplicates": {"duplicate_keys": None}},
-        ) as ts:
-            self.assertEqual(len(ts.data("NOx")), 8)
-        with engine.open(
-            self.multifile_dir + "/csvReader_testdata2.csv",
-            filters={
-                "duplicates": {"duplicate_keys": ["stations", "start_times", "values"]}
-            },
-        ) as ts:
-            self.assertEqual(len(ts.data("NOx")), 10)
-
-    def test_time_resolution_filter(self):
-        engine = pyaro.list_timeseries_engines()["csv_timeseries"]
-        with self.assertRaises(FilterException):
-            with engine.open(
-                self.file,
-                filters={"time_resolution": {"resolutions": ["ldjf4098"]}},
-            ) as ts:
-                pass
-        with engine.open(
-            self.file,
-            filters={"time_resolution": {"resolutions": ["1 day"]}},
-        ) as ts:
-            count = 0
-            for var in ts.variables():
-                count += len(ts.data(var))
-            self.assertEqual(count, 208)
-        for resolution in "1 minute, 1 hour, 1week, 1month, 3year".split(","):
-            with engine.open(
-                self.file,
-                filters={"time_resolution": {"resolutions": ["1 hour"]}},
-            ) as ts:
-                count = 0
-                for var in ts.variables():
-                    count += len(ts.data(var))
-                self.assertEqual(count, 0)
-
-    def test_filterFactory(self):
-        filters = pyaro.timeseries.filters.list()
-        print(filters["variables"])
-        self.assertTrue(True)
-
-    def test_filterCollection(self):
-        with pyaro.open_timeseries(
-            "csv_timeseries",
-            filename=self.file,
-        ) as ts:
-            filters = pyaro.timeseries.FilterCollection(
-                {
-                    "countries": {"include": ["NO"]},
-                    "stations": {"include": ["station1"]},
-                }
+
+def test_relaltitude_filter_1(engine):
+    with engine.open(
+        filename=ELEVATION_FILE,
+        filters=[
+            pyaro.timeseries.filters.get(
+                "relaltitude",
+                topo_file=TOPOGRAPHY_FILE,
+                rdiff=0,
             )
-            data1 = ts.data("SOx")
-            data2 = filters.filter(ts, "SOx")
-            self.assertEqual(len(data1), 2 * len(data2))
-
-    @unittest.skipUnless(has_pandas, "no pandas installed")
-    def test_timeseries_data_to_pd(self):
-        with pyaro.open_timeseries(
-            "csv_timeseries", *[self.file], **{"filters": []}
-        ) as ts:
-            count = 0
-            vars = list(ts.variables())
-            data = ts.data(vars[0])
-            df = pyaro.timeseries_data_to_pd(data)
-            self.assertEqual(len(df), len(data))
-            self.assertEqual(len(df["values"]), len(data["values"]))
-            self.assertEqual(df["values"][3], data["values"][3])
-
-    @unittest.skipUnless(has_geocode, "geocode-reverse-natural-earth not available")
-    def test_country_lookup(self):
-        with pyaro.open_timeseries(
-            "csv_timeseries", *[self.file], **{"filters": [], "country_lookup": True}
-        ) as ts:
-            count = 0
-            vars = list(ts.variables())
-            data = ts.data(vars[0])
-        self.assertTrue(False)
-
-    def test_altitude_filter_1(self):
-        engines = pyaro.list_timeseries_engines()
-        with engines["csv_timeseries"].open(
-            filename=self.elevation_file,
-            filters=[pyaro.timeseries.filters.get("altitude", max_altitude=150)],
-            columns={
-                "variable": 0,
-                "station": 1,
-                "longitude": 2,
-                "latitude": 3,
-                "value": 4,
-                "units": 5,
-                "start_time": 6,
-                "end_time": 7,
-                "altitude": 9,
-                "country": "NO",
-                "standard_deviation": "NaN",
-                "flag": "0",
-            },
-        ) as ts:
-            self.assertEqual(len(ts.stations()), 1)
+        ],
+        columns={
+            "variable": 0,
+            "station": 1,
+            "longitude": 2,
+            "latitude": 3,
+            "value": 4,
+            "units": 5,
+            "start_time": 6,
+            "end_time": 7,
+            "altitude": 9,
+            "country": "NO",
+            "standard_deviation": "NaN",
+            "flag": "0",
+        },
+    ) as ts:
+        assert len(ts.stations()) == 0
 
-    def test_altitude_filter_2(self):
-        engines = pyaro.list_timeseries_engines()
-        with engines["csv_timeseries"].open(
-            filename=self.elevation_file,
-            filters=[pyaro.timeseries.filters.get("altitude", min_altitude=250)],
-            columns={
-                "variable": 0,
-                "station": 1,
-                "longitude": 2,
-                "latitude": 3,
-                "value": 4,
-                "units": 5,
-                "start_time": 6,
-                "end_time": 7,
-                "altitude": 9,
-                "country": "NO",
-                "standard_deviation": "NaN",
-                "flag": "0",
-            },
-        ) as ts:
-            self.assertEqual(len(ts.stations()), 1)
 
-    def test_altitude_filter_3(self):
-        engines = pyaro.list_timeseries_engines()
-        with engines["csv_timeseries"].open(
-            filename=self.elevation_file,
-            filters=[
-                pyaro.timeseries.filters.get(
-                    "altitude", min_altitude=150, max_altitude=250
-                )
-            ],
-            columns={
-                "variable": 0,
-                "station": 1,
-                "longitude": 2,
-                "latitude": 3,
-                "value": 4,
-                "units": 5,
-                "start_time": 6,
-                "end_time": 7,
-                "altitude": 9,
-                "country": "NO",
-                "standard_deviation": "NaN",
-                "flag": "0",
-            },
-        ) as ts:
-            self.assertEqual(len(ts.stations()), 1)
+def test_relaltitude_filter_2(engine):
+    with engine.open(
+        filename=ELEVATION_FILE,
+        filters=[
+            pyaro.timeseries.filters.get(
+                "relaltitude",
+                topo_file=TOPOGRAPHY_FILE,
+                rdiff=90,
+            )
+        ],
+        columns={
+            "variable": 0,
+            "station": 1,
+            "longitude": 2,
+            "latitude": 3,
+            "value": 4,
+            "units": 5,
+            "start_time": 6,
+            "end_time": 7,
+            "altitude": 9,
+            "country": "NO",
+            "standard_deviation": "NaN",
+            "flag": "0",
+        },
+    ) as ts:
+        # At rdiff = 90, only the first station should be included.
+        assert len(ts.stations()) == 1
 
-    def test_relaltitude_filter_emep_1(self):
-        engines = pyaro.list_timeseries_engines()
-        with engines["csv_timeseries"].open(
-            filename=self.elevation_file,
-            filters=[
-                pyaro.timeseries.filters.get(
-                    "relaltitude",
-                    topo_file="./tests/testdata/datadir_elevation/topography.nc",
-                    rdiff=0,
-                )
-            ],
-            columns={
-                "variable": 0,
-                "station": 1,
-                "longitude": 2,
-                "latitude": 3,
-                "value": 4,
-                "units": 5,
-                "start_time": 6,
-                "end_time": 7,
-                "altitude": 9,
-                "country": "NO",
-                "standard_deviation": "NaN",
-                "flag": "0",
-            },
-        ) as ts:
-            # Altitudes in test dataset:
-            # Station     | Alt_obs   | Modeobs | rdiff |
-            # Station 1   | 100       | 12.2554 |  87.7446 |
-            # Station 2   | 200       |  4.9016 | 195.0984 |
-            # Station 3   | 300       |  4.9016 | 195.0984 |
-            # Since rtol = 0, no station should be included.
-            self.assertEqual(len(ts.stations()), 0)
-
-    def test_relaltitude_filter_emep_2(self):
-        engines = pyaro.list_timeseries_engines()
-        with engines["csv_timeseries"].open(
-            filename=self.elevation_file,
-            filters=[
-                pyaro.timeseries.filters.get(
-                    "relaltitude",
-                    topo_file="./tests/testdata/datadir_elevation/topography.nc",
-                    rdiff=90,
-                )
-            ],
-            columns={
-                "variable": 0,
-                "station": 1,
-                "longitude": 2,
-                "latitude": 3,
-                "value": 4,
-                "units": 5,
-                "start_time": 6,
-                "end_time": 7,
-                "altitude": 9,
-                "country": "NO",
-                "standard_deviation": "NaN",
-                "flag": "0",
-            },
-        ) as ts:
-            # At rdiff = 90, only the first station should be included.
-            self.assertEqual(len(ts.stations()), 1)
 
-    def test_relaltitude_filter_emep_3(self):
-        engines = pyaro.list_timeseries_engines()
-        with engines["csv_timeseries"].open(
-            filename=self.elevation_file,
-            filters=[
-                pyaro.timeseries.filters.get(
-                    "relaltitude",
-                    topo_file="./tests/testdata/datadir_elevation/topography.nc",
-                    rdiff=300,
-                )
-            ],
-            columns={
-                "variable": 0,
-                "station": 1,
-                "longitude": 2,
-                "latitude": 3,
-                "value": 4,
-                "units": 5,
-                "start_time": 6,
-                "end_time": 7,
-                "altitude": 9,
-                "country": "NO",
-                "standard_deviation": "NaN",
-                "flag": "0",
-            },
-        ) as ts:
-            # Since rdiff=300, all stations should be included.
-            self.assertEqual(len(ts.stations()), 3)
+def test_relaltitude_filter_3(engine):
+    with engine.open(
+        filename=ELEVATION_FILE,
+        filters=[
+            pyaro.timeseries.filters.get(
+                "relaltitude",
+                topo_file=TOPOGRAPHY_FILE,
+                rdiff=300,
+            )
+        ],
+        columns={
+            "variable": 0,
+            "station": 1,
+            "longitude": 2,
+            "latitude": 3,
+            "value": 4,
+            "units": 5,
+            "start_time": 6,
+            "end_time": 7,
+            "altitude": 9,
+            "country": "NO",
+            "standard_deviation": "NaN",
+            "flag": "0",
+        },
+    ) as ts:
+        # Since rdiff=300, all stations should be included.
+        assert len(ts.stations()) == 3
 
-    def test_relaltitude_filter_1(self):
-        engines = pyaro.list_timeseries_engines()
-        with engines["csv_timeseries"].open(
-            filename=self.elevation_file,
-            filters=[
-                pyaro.timeseries.filters.get(
-                    "relaltitude",
-                    topo_file="./tests/testdata/datadir_elevation/topography.nc",
-                    rdiff=0,
-                )
-            ],
-            columns={
-                "variable": 0,
-                "station": 1,
-                "longitude": 2,
-                "latitude": 3,
-                "value": 4,
-                "units": 5,
-                "start_time": 6,
-                "end_time": 7,
-                "altitude": 9,
-                "country": "NO",
-                "standard_deviation": "NaN",
-                "flag": "0",
-            },
-        ) as ts:
-            self.assertEqual(len(ts.stations()), 0)
 
-    def test_relaltitude_filter_2(self):
-        engines = pyaro.list_timeseries_engines()
-        with engines["csv_timeseries"].open(
-            filename=self.elevation_file,
-            filters=[
-                pyaro.timeseries.filters.get(
-                    "relaltitude",
-                    topo_file="./tests/testdata/datadir_elevation/topography.nc",
-                    rdiff=90,
-                )
-            ],
-            columns={
-                "variable": 0,
-                "station": 1,
-                "longitude": 2,
-                "latitude": 3,
-                "value": 4,
-                "units": 5,
-                "start_time": 6,
-                "end_time": 7,
-                "altitude": 9,
-                "country": "NO",
-                "standard_deviation": "NaN",
-                "flag": "0",
-            },
-        ) as ts:
-            # At rdiff = 90, only the first station should be included.
-            self.assertEqual(len(ts.stations()), 1)
+def test_valley_floor_filter(engine):
+    with engine.open(
+        filename=ELEVATION_FILE,
+        filters=[
+            pyaro.timeseries.filters.get(
+                "valleyfloor_relaltitude",
+                topo=GTOPO30_FILE,
+                radius=5000,
+                lower=150,
+                upper=250,
+            )
+        ],
+        columns={
+            "variable": 0,
+            "station": 1,
+            "longitude": 2,
+            "latitude": 3,
+            "value": 4,
+            "units": 5,
+            "start_time": 6,
+            "end_time": 7,
+            "altitude": 9,
+            "country": "NO",
+            "standard_deviation": "NaN",
+            "flag": "0",
+        },
+    ) as ts:
+        assert len(ts.stations()) == 3
 
-    def test_relaltitude_filter_3(self):
-        engines = pyaro.list_timeseries_engines()
-        with engines["csv_timeseries"].open(
-            filename=self.elevation_file,
-            filters=[
-                pyaro.timeseries.filters.get(
-                    "relaltitude",
-                    topo_file="./tests/testdata/datadir_elevation/topography.nc",
-                    rdiff=300,
-                )
-            ],
-            columns={
-                "variable": 0,
-                "station": 1,
-                "longitude": 2,
-                "latitude": 3,
-                "value": 4,
-                "units": 5,
-                "start_time": 6,
-                "end_time": 7,
-                "altitude": 9,
-                "country": "NO",
-                "standard_deviation": "NaN",
-                "flag": "0",
-            },
-        ) as ts:
-            # Since rdiff=300, all stations should be included.
-            self.assertEqual(len(ts.stations()), 3)
 
-    def test_valley_floor_filter(self):
-        engines = pyaro.list_timeseries_engines()
-        with engines["csv_timeseries"].open(
-            filename=self.elevation_file,
+def test_valley_floor_filter_reopen(engine):
+    # filters with state must not be shared between readers by the FilterFactory
+    for _ in range(2):
+        with engine.open(
+            filename=ELEVATION_FILE,
             filters=[
                 pyaro.timeseries.filters.get(
                     "valleyfloor_relaltitude",
-                    topo="tests/testdata/datadir_elevation/gtopo30_subset.nc",
+                    topo=GTOPO30_FILE,
                     radius=5000,
                     lower=150,
                     upper=250,
@@ -697,8 +666,4 @@ class TestCSVTimeSeriesReader(unittest.TestCase):
                 "flag": "0",
             },
         ) as ts:
-            self.assertEqual(len(ts.stations()), 3)
-
-
-if __name__ == "__main__":
-    unittest.main()
+            assert len(ts.stations()) == 3
@@ -0,0 +1,46 @@
+import numpy as np
+
+from pyaro.timeseries.Data import NpStructuredData
+
+
+def _data(stations):
+    data = NpStructuredData("SOx", "ug/m3")
+    for station in stations:
+        data.append(1.0, station, 60.0, 10.0, 100.0, "2023-01-01", "2023-01-02")
+    return data
+
+
+def test_station_codes():
+    data = _data(["stat2", "stat1", "stat2"])
+    unique, inverse = data.station_codes()
+    assert list(unique) == ["stat1", "stat2"]
+    assert list(unique[inverse]) == ["stat2", "stat1", "stat2"]
+
+
+def test_station_codes_after_append():
+    data = _data(["stat1", "stat2"])
+    data.station_codes()
+    data.append(1.0, "stat3", 60.0, 10.0, 100.0, "2023-01-01", "2023-01-02")
+    unique, inverse = data.station_codes()
+    assert list(unique[inverse]) == ["stat1", "stat2", "stat3"]
+
+
+def test_station_codes_after_set_data():
+    data = _data(["stat1", "stat2"])
+    data.station_codes()
+    new = _data(["stat3", "stat4"])
+    data.set_data(data.variable, data.units, new[:])
+    unique, inverse = data.station_codes()
+    assert list(unique[inverse]) == ["stat3", "stat4"]
+    assert np.array_equal(data.slice([1]).station_codes()[0], ["stat4"])
+
+
+def test_station_codes_subclass_without_init():
+    class PluginData(NpStructuredData):
+        def __init__(self):
+            self._variable = "SOx"
+            self._units = "ug/m3"
+            self._data = _data(["stat1", "stat2"])._data
+
+    unique, inverse = PluginData().station_codes()
+    assert list(unique[inverse]) == ["stat1", "stat2"]
@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+from pyaro.timeseries.Filter import BoundingBoxException, BoundingBoxFilter
+from pyaro.timeseries.Station import Station
+
+
+def _stations(lats, lons):
+    return {
+        f"stat{i}": Station(
+            {
+                "station": f"stat{i}",
+                "latitude": lat,
+                "longitude": lon,
+                "altitude": 0.0,
+                "long_name": f"station {i}",
+                "country": "NO",
+                "url": "",
+            }
+        )
+        for i, (lat, lon) in enumerate(zip(lats, lons))
+    }
+
+
+def test_filter_stations_matches_has_location():
+    rng = np.random.default_rng(1)
+    stations = _stations(rng.uniform(-90, 90, 500), rng.uniform(-180, 180, 500))
+    boxes = [
+        BoundingBoxFilter(),
+        BoundingBoxFilter(include=[(60, 20, 50, 0)]),
+        BoundingBoxFilter(include=[(60, 20, 50, 0), (10, 180, -90, 90)]),
+        BoundingBoxFilter(exclude=[(90, 0, -90, -180)]),
+        BoundingBoxFilter(include=[(90, 180, 0, -180)], exclude=[(60, 20, 50, 0)]),
+    ]
+    for bbfilter in boxes:
+        expected = [
+            name
+            for name, stat in stations.items()
+            if bbfilter.has_location(stat.latitude, stat.longitude)
+        ]
+        assert list(bbfilter.filter_stations(stations)) == expected
+
+
+def test_filter_stations_on_box_edges():
+    stations = _stations([60, 50, 60.5], [20, 0, 10])
+    bbfilter = BoundingBoxFilter(include=[(60, 20, 50, 0)])
+    assert list(bbfilter.filter_stations(stations)) == ["stat0", "stat1"]
+    assert bbfilter.filter_stations({}) == {}
+
+
+def test_non_numeric_boxes():
+    for boxes in [[("10", 10, 0, 0)], [(60, 20, 50, 0), ("10", 10, 0, 0)]]:
+        with pytest.raises(BoundingBoxException):
+            BoundingBoxFilter(include=boxes)
+
+
+def test_filter_stations_in_box_chunks(monkeypatch):
+    rng = np.random.default_rng(2)
+    stations = _stations(rng.uniform(-90, 90, 200), rng.uniform(-180, 180, 200))
+    south = rng.uniform(-90, 80, 50)
+    west = rng.uniform(-180, 170, 50)
+    boxes = [(s + 10, w + 10, s, w) for s, w in zip(south, west)]
+    bbfilter = BoundingBoxFilter(include=boxes)
+    expected = bbfilter.filter_stations(stations)
+    # a mask of 7 elements tests less than one box per chunk for 200 stations
+    monkeypatch.setattr(BoundingBoxFilter, "_max_mask_size", 7)
+    assert bbfilter.filter_stations(stations) == expected
+    monkeypatch.setattr(BoundingBoxFilter, "_max_mask_size", 1000)
+    assert bbfilter.filter_stations(stations) == expected
@@ -0,0 +1,69 @@
+from pyaro.timeseries.Data import Flag
+from pyaro.timeseries.Filter import FilterFactory, StationFilter, filters
+
+
+def test_get_without_kwargs():
+    assert filters.get("stations") is filters.list()["stations"]
+    assert filters.get("relaltitude") is not filters.list()["relaltitude"]
+
+
+def test_reuse_with_list_and_dict_kwargs():
+    box = [(90, 180, -90, 0)]
+    bbfilter = filters.get("bounding_boxes", include=box)
+    assert bbfilter is filters.get("bounding_boxes", include=box)
+    assert bbfilter is not filters.get("bounding_boxes", exclude=box)
+    rename = {"SOx": "oxidised_sulphur"}
+    vfilter = filters.get("variables", reader_to_new=rename)
+    rename["SOx"] = "sulphur"
+    assert vfilter is not filters.get("variables", reader_to_new=rename)
+    assert vfilter.init_kwargs()["reader_to_new"]["SOx"] == "oxidised_sulphur"
+
+
+def test_cache_is_bounded():
+    first = filters.get("stations", include=("station0",))
+    for i in range(1, FilterFactory.cache_size + 1):
+        filters.get("stations", include=(f"station{i}",))
+    assert len(filters._cache) <= FilterFactory.cache_size
+    assert filters.get("stations", include=("station0",)) is not first
+
+
+def test_stateful_filters_not_shared():
+    kwargs = dict(topo="topography.nc", radius=5000, lower=150, upper=250)
+    vfilter = filters.get("valleyfloor_relaltitude", **kwargs)
+    assert vfilter is not filters.get("valleyfloor_relaltitude", **kwargs)
+
+
+def test_init_kwargs_do_not_change_cached_filters():
+    vfilter = filters.get("variables", reader_to_new={"SOx": "oxs"})
+    vfilter.init_kwargs()["reader_to_new"]["SOx"] = "other"
+    assert vfilter.init_kwargs()["reader_to_new"] == {"SOx": "oxs"}
+    rfilter = filters.get("time_resolution", resolutions=["1 day"])
+    rfilter.init_kwargs()["resolutions"].append("1 hour")
+    assert rfilter.init_kwargs()["resolutions"] == ["1 day"]
+    dfilter = filters.get("duplicates", duplicate_keys=["stations"])
+    dfilter.init_kwargs()["duplicate_keys"].append("values")
+    assert dfilter.init_kwargs()["duplicate_keys"] == ["stations"]
+
+
+def test_subclasses_not_cached():
+    class StatefulStationFilter(StationFilter):
+        def name(self):
+            return "stateful_stations"
+
+    factory = FilterFactory()
+    factory.register(StatefulStationFilter())
+    try:
+        sfilter = factory.get("stateful_stations", include=["station1"])
+        assert sfilter is not factory.get("stateful_stations", include=["station1"])
+        registered = factory.list()["stateful_stations"]
+        assert factory.get("stateful_stations") is not registered
+    finally:
+        del factory._filters["stateful_stations"]
+
+
+def test_cache_key_types():
+    ffilter = filters.get("flags", include=[1])
+    assert filters.get("flags", include=[Flag.INVALID]) is not ffilter
+    assert filters.get("flags", include=[1.0]) is not ffilter
+    include = filters.get("flags", include=[Flag.INVALID]).init_kwargs()["include"]
+    assert type(include[0]) is Flag
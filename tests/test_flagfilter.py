@@ -0,0 +1,35 @@
+import numpy as np
+
+from pyaro.timeseries.Data import Flag, NpStructuredData
+from pyaro.timeseries.Filter import FlagFilter
+
+
+def _data(flags):
+    data = NpStructuredData("SOx", "ug/m3")
+    for flag in flags:
+        data.append(1.0, "stat1", 60.0, 10.0, 100.0, "2023-01-01", "2023-01-02", flag)
+    return data
+
+
+def test_flags():
+    data = _data([Flag.VALID, Flag.INVALID, Flag.BELOW_THRESHOLD, -1, 7])
+    idx = FlagFilter().filter_data_idx(data, {}, [])
+    assert list(idx) == [True, True, True, False, False]
+    idx = FlagFilter(exclude=[Flag.INVALID]).filter_data_idx(data, {}, [])
+    assert list(idx) == [True, False, True, False, False]
+
+
+def test_unknown_flags():
+    data = _data([Flag.VALID, 7, 8])
+    idx = FlagFilter(include=[7]).filter_data_idx(data, {}, [])
+    assert list(idx) == [False, True, False]
+    idx = FlagFilter(include=[7], exclude=[7]).filter_data_idx(data, {}, [])
+    assert not idx.any()
+
+
+def test_float_flags():
+    class FloatFlags:
+        flags = np.array([0.0, 1.0, 1.5, 2.0])
+
+    idx = FlagFilter(include=[Flag.INVALID]).filter_data_idx(FloatFlags(), {}, [])
+    assert list(idx) == [False, True, False, False]
@@ -1,6 +1,7 @@
 from datetime import datetime
 
 import numpy as np
+import pytest
 
 from pyaro.timeseries.Filter import TimeBoundsFilter
 
@@ -29,3 +30,47 @@ def test_roundtrip():
 
     init = bounds.init_kwargs()
     assert init["start_include"] == [("2023-01-01 00:00:03", "2024-01-01 00:10:00")]
+
+
+def test_overlapping_bounds():
+    bounds = TimeBoundsFilter(
+        startend_include=[
+            ("2023-01-01 00:00:00", "2023-03-01 00:00:00"),
+            ("2023-01-15 00:00:00", "2023-01-20 00:00:00"),
+        ],
+        startend_exclude=[
+            ("2023-02-01 00:00:00", "2023-02-10 00:00:00"),
+            ("2023-02-05 00:00:00", "2023-02-07 00:00:00"),
+        ],
+    )
+
+    dt_start = np.array(
+        ["2022-12-31", "2023-01-16", "2023-01-25", "2023-02-02", "2023-02-20"],
+        dtype="datetime64[s]",
+    )
+    dt_end = dt_start + np.timedelta64(2, "D")
+    idx = bounds.contains(dt_start, dt_end)
+    assert idx.tolist() == [False, True, True, False, True]
+
+
+def test_roundtrip_end():
+    bounds = TimeBoundsFilter(
+        end_include=[("2023-01-01 00:00:00", "2023-06-01 00:00:00")],
+        end_exclude=[("2023-02-01 00:00:00", "2023-03-01 00:00:00")],
+    )
+
+    init = bounds.init_kwargs()
+    assert init["end_include"] == [("2023-01-01 00:00:00", "2023-06-01 00:00:00")]
+    assert init["end_exclude"] == [("2023-02-01 00:00:00", "2023-03-01 00:00:00")]
+    assert init["startend_include"] == []
+    assert bounds.envelope() == (datetime(2023, 1, 1), datetime(2023, 6, 1))
+
+
+def test_time_format():
+    bounds = TimeBoundsFilter(
+        start_include=[("1997-1-1 00:00:00", "1998-01-01 00:00:00")]
+    )
+    assert bounds.envelope()[0] == datetime(1997, 1, 1)
+    for time in ["1997-01-01", "1997-01-01T00:00:00", "1997-01-01 00:00:00.5"]:
+        with pytest.raises(ValueError):
+            TimeBoundsFilter(start_include=[(time, "1998-01-01 00:00:00")])